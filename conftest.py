@@ -0,0 +1,8 @@
+import asyncio
+import sys
+
+# Run the asyncio tests on uvloop's libuv-based event loop; uvloop is not available on Windows
+if sys.platform != "win32":
+    import uvloop
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
@@ -1,73 +1,164 @@
+import array
+import logging
+import sys
 import pytest
 import pytest_asyncio
-import requests
 import asyncio
 import aiohttp
-from unittest.mock import patch, AsyncMock
+import msgspec
+import orjson
+from aioresponses import aioresponses
+from async_lru import alru_cache
+from collections import deque
 
-def fetch_top_stories():
-    """Fetch the list of top story IDs from Hacker News top-stories API. It may contain Job(s)"""
-    url = "https://hacker-news.firebaseio.com/v0/topstories.json?print=pretty"
+logger = logging.getLogger("hn_tests")
+
+# Item types allowed in the top-stories list
+_VALID_TYPES = frozenset({"story", "job"})
+
+class HNItem(msgspec.Struct, omit_defaults=True):
+    """The fields of a Hacker News item that the tests inspect; any other field is skipped while decoding."""
+    id: int
+    type: str
+    parent: int | None = None
+    descendants: int = 0
+    kids: list[int] = []
+
+# Decodes and validates items in C; a null body (non-existent id) decodes to None
+_ITEM_DECODER = msgspec.json.Decoder(HNItem | None)
+
+# Closed TLS transports only leak on Pythons without the CPython fix (python/cpython#118960); on fixed
+# versions aiohttp ignores enable_cleanup_closed and emits a DeprecationWarning, so only set it where needed
+_NEEDS_CLEANUP_CLOSED = sys.version_info < (3, 12, 7) or (3, 13, 0) <= sys.version_info < (3, 13, 1)
+
+# Request compressed payloads from the shared aiohttp session
+_HEADERS = {"Accept-Encoding": "gzip, deflate", "User-Agent": "hn-tests/1"}
+
+_TOP_STORIES_URL = "https://hacker-news.firebaseio.com/v0/topstories.json?print=pretty"
+
+async def fetch_top_stories_async(session):
+    """Fetch the top story IDs from Hacker News top-stories API as an int array. It may contain Job(s)"""
     try:
-        response = requests.get(url)
-        print(f"Validation - Status code[ top-stories API ] :: Expected:200  Actual:{response.status_code}")
-        response.raise_for_status()
-        data = response.json()
-        print(f"Validation - Data Type[ top-stories API ] :: Expected:<class 'list'> Actual:{type(data)}")
+        async with session.get(_TOP_STORIES_URL) as response:
+            data = orjson.loads(await response.read())
+        logger.debug("Validation - Data Type[ top-stories API ] :: Expected:<class 'list'> Actual:%s", type(data))
         if not isinstance(data, list):
-            print(f"Error - top-stories response is not a list, got {type(data)}")
+            logger.warning("Error - top-stories response is not a list, got %s", type(data))
             return None
-        if not all(isinstance(item, int) for item in data):
-            print(f"Error: top-stories response contains non-integer items: {data}")
+        try:
+            # The C-level array constructor rejects any non-integer item in a single pass and
+            # stores the ids as a compact int32 buffer rather than a list of boxed ints
+            ids = array.array('i', data)
+        except (TypeError, OverflowError):
+            logger.warning("Error: top-stories response contains non-integer or out-of-range (int32) items: %s", data)
             return None
-        return data
-    except requests.exceptions.RequestException:
+        return ids
+    except aiohttp.ClientResponseError as e:
+        # The session raises on any non-2xx status before the response body is read
+        logger.warning("Error - Status code[ top-stories API ] :: Expected:200  Actual:%s for %s", e.status, e.request_info.real_url)
+        return None
+    except (aiohttp.ClientError, asyncio.TimeoutError, orjson.JSONDecodeError):
         return None
 
-async def fetch_item_async(item_id, session):
-    """Fetch a single item from Hacker News items API asynchronously."""
+@alru_cache(maxsize=4096)
+async def _fetch_item_cached(item_id, session):
+    """Fetch a single item, memoized per (item_id, session). Failed fetches raise and are not cached."""
     url = f"https://hacker-news.firebaseio.com/v0/item/{item_id}.json"
+    async with session.get(url) as response:
+        return _ITEM_DECODER.decode(await response.read())
+
+async def fetch_item_async(item_id, session):
+    """Fetch a single item from Hacker News items API asynchronously, as an HNItem.
+
+    Transport errors and malformed JSON return None; a payload that violates the HNItem schema
+    raises msgspec.ValidationError so the calling test fails.
+    """
     try:
-        async with session.get(url) as response:
-            response.raise_for_status()
-            return await response.json()
-    except aiohttp.ClientError:
+        return await _fetch_item_cached(item_id, session)
+    except msgspec.ValidationError:
+        raise
+    except (aiohttp.ClientError, asyncio.TimeoutError, msgspec.DecodeError):
         return None
 
-@pytest_asyncio.fixture(scope="function")
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
 async def client_session():
-    """Fixture to provide an aiohttp ClientSession."""
-    async with aiohttp.ClientSession() as session:
+    """Fixture to provide an aiohttp ClientSession shared by all tests, so its keep-alive pool is reused."""
+    # Sized so the 500-item fan-out in test_top_stories is not throttled by the default 100-connection cap
+    connector = aiohttp.TCPConnector(limit=256, limit_per_host=64, use_dns_cache=True, ttl_dns_cache=600,
+                                     keepalive_timeout=75, enable_cleanup_closed=_NEEDS_CLEANUP_CLOSED,
+                                     happy_eyeballs_delay=0.1)
+    # raise_for_status=True turns every non-2xx response into a ClientResponseError
+    async with aiohttp.ClientSession(connector=connector, headers=_HEADERS, raise_for_status=True,
+                                     timeout=aiohttp.ClientTimeout(total=15)) as session:
         yield session
+    _fetch_item_cached.cache_clear()
 
-@pytest.fixture(scope="function")
-def top_stories():
-    """Fixture to provide top stories list."""
-    stories = fetch_top_stories()
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def top_stories(client_session):
+    """Fixture to provide top stories list, fetched over the shared client_session."""
+    stories = await fetch_top_stories_async(client_session)
     assert stories is not None, "Failed to fetch top stories"
     assert len(stories) > 0, "Top stories list is empty"
     return stories
 
-async def get_stories_with_less_comments(top_stories, client_session, threshold=10):
-    """Helper: return list of stories with fewer than `threshold` descendants using 'descendants' field."""
-    stories_with_less_comments = []
-    total = 0
-    for story_id in top_stories:
-        if total > 5:
-            continue
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def items_map(top_stories, client_session):
+    """Fixture to provide every top-stories item, fetched concurrently once and keyed by id."""
+    items = await asyncio.gather(*(fetch_item_async(item_id, client_session) for item_id in top_stories))
+    return dict(zip(top_stories, items))
 
-        story_item = await fetch_item_async(story_id, client_session)
-        if story_item:
-            # Use the 'descendants' field directly
-            count = story_item.get("descendants", 0)  # defaults to 0 if not present
-
-            if threshold > count > 0:
-                total+=1
-                stories_with_less_comments.append(story_id)
-    print(stories_with_less_comments)
+async def fetch_front_page_comment_counts(session):
+    """Fetch (story id, comment count) pairs for the front page in one call to the HN Algolia search API."""
+    url = "https://hn.algolia.com/api/v1/search?tags=front_page&hitsPerPage=50"
+    try:
+        async with session.get(url) as response:
+            data = orjson.loads(await response.read())
+        return [(int(hit["objectID"]), hit.get("num_comments") or 0) for hit in data["hits"]]
+    except (aiohttp.ClientError, asyncio.TimeoutError, orjson.JSONDecodeError, KeyError, TypeError, ValueError):
+        return None
+
+async def get_stories_with_less_comments(top_stories, client_session, threshold=10, limit=6, concurrency=16):
+    """
+    Helper: return up to `limit` stories with fewer than `threshold` comments.
+    - Selects from Algolia's front-page 'num_comments' counts, restricted to ids in `top_stories`
+    - Falls back to each item's Firebase 'descendants' field if that search fails or matches nothing
+    """
+    # One bulk search call usually suffices; fall back to per-item fetches if it fails or finds nothing
+    front_page = await fetch_front_page_comment_counts(client_session)
+    if front_page:
+        top_story_ids = set(top_stories)
+        stories_with_less_comments = [story_id for story_id, count in front_page
+                                      if story_id in top_story_ids and threshold > count > 0][:limit]
+        if stories_with_less_comments:
+            logger.debug("Stories with less comments: %s", stories_with_less_comments)
+            return stories_with_less_comments
+
+    sem = asyncio.Semaphore(concurrency)
+
+    async def _guarded(story_id):
+        async with sem:
+            return story_id, await fetch_item_async(story_id, client_session)
+
+    stories_with_less_comments = []
+    # At most `concurrency` fetches are in flight. Once enough stories are found, tasks still waiting on the
+    # semaphore are cancelled; in-flight fetches are shielded by alru_cache and run on to fill the cache
+    tasks = [asyncio.ensure_future(_guarded(story_id)) for story_id in top_stories]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            story_id, story_item = await next_done
+            if story_item is not None:
+                # Use the 'descendants' field directly (defaults to 0 if not present)
+                if threshold > story_item.descendants > 0:
+                    stories_with_less_comments.append(story_id)
+                    if len(stories_with_less_comments) >= limit:
+                        break
+    finally:
+        for task in tasks:
+            task.cancel()
+    logger.debug("Stories with less comments: %s", stories_with_less_comments)
     return stories_with_less_comments
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="session")
 async def test_top_stories(top_stories, client_session):
     """
     - Test Retrieving top stories with the Top Stories API returns correct Status Code
@@ -75,18 +166,18 @@ async def test_top_stories(top_stories, client_session):
     - Test the API call fetches a maximum of 500 items in API response
     - Test the API call fetches items which could only be in [story, job]
     """
-    print(f"Validation - Total items found in top-stories response:: Expected:<=500 Actual:{len(top_stories)}")
+    logger.debug("Validation - Total items found in top-stories response:: Expected:<=500 Actual:%d", len(top_stories))
     assert len(top_stories) <= 500
-    assert all(isinstance(item, int) for item in top_stories), "Top stories contains non-integer items"
 
-    tasks = [fetch_item_async(item_id, client_session) for item_id in top_stories]
-    items = await asyncio.gather(*tasks, return_exceptions=True)
-    print("Checking if all items in top-stories are either story or job...")
-    for item in items:
-        if item and isinstance(item, dict):
-            assert item.get("type") in ["story", "job"], f"Item {item.get('id')} has invalid type {item.get('type')}"
+    async with asyncio.TaskGroup() as tg:
+        tasks = [tg.create_task(fetch_item_async(item_id, client_session)) for item_id in top_stories]
+    logger.debug("Checking if all items in top-stories are either story or job...")
+    for task in tasks:
+        item = task.result()
+        if item is not None:
+            assert item.type in _VALID_TYPES, f"Item {item.id} has invalid type {item.type}"
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="session")
 async def test_top_story_from_stories(top_stories, client_session):
     """
     - Test Retrieving top story from the list of top-stories using items-api returns correct status code
@@ -95,13 +186,10 @@ async def test_top_story_from_stories(top_stories, client_session):
     top_story_id = top_stories[0]
     item = await fetch_item_async(top_story_id, client_session)
     assert item is not None, f"Failed to fetch item with ID {top_story_id}"
-    assert isinstance(item, dict), f"Item with ID {top_story_id} is not a dictionary"
-    assert "id" in item, f"Item with ID {top_story_id} is missing 'id' field"
-    assert isinstance(item["id"], int), f"ID field for item {top_story_id} is not an integer"
-    assert item["id"] == top_story_id, f"Item ID {item['id']} does not match requested ID {top_story_id}"
+    assert item.id == top_story_id, f"Item ID {item.id} does not match requested ID {top_story_id}"
 
-@pytest.mark.asyncio
-async def test_top_comment_from_top_story_in_top_stories(top_stories, client_session):
+@pytest.mark.asyncio(loop_scope="session")
+async def test_top_comment_from_top_story_in_top_stories(top_stories, items_map, client_session):
     """
     - Test Retrieving top comment from the top story in the list of top-stories using items-api returns correct status code
     - Test items-api returns non-empty list of kids/comments - fetch_valid_item ensures we have correct input data
@@ -110,131 +198,178 @@ async def test_top_comment_from_top_story_in_top_stories(top_stories, client_ses
     """
 
     "fetches items from top stories which contains at least one kid"
-    async def fetch_valid_item(session):
-        for story_id in top_stories:
-            item = await fetch_item_async(story_id, session)
-            if item and isinstance(item, dict) and "id" in item and \
-                    isinstance(item["id"], int) and item["id"] == story_id and \
-                    item.get("kids", []) and isinstance(item["kids"], list) and len(item["kids"]) > 0:
-                return item, story_id
-        return None, None
-
-    story_item, top_story_id = await fetch_valid_item(client_session)
+    def fetch_valid_item():
+        return next(((item, story_id) for story_id in top_stories
+                     if (item := items_map[story_id]) is not None and item.id == story_id and len(item.kids) > 0),
+                    (None, None))
+
+    story_item, top_story_id = fetch_valid_item()
     assert story_item is not None, "No top story with non-empty kids array found"
 
-    top_comment_id = story_item["kids"][0]
+    top_comment_id = story_item.kids[0]
     comment_item = await fetch_item_async(top_comment_id, client_session)
     assert comment_item is not None, f"Failed to fetch comment with ID {top_comment_id}"
-    assert isinstance(comment_item, dict), f"Comment with ID {top_comment_id} is not a dictionary"
-    assert "id" in comment_item, f"Comment with ID {top_comment_id} is missing 'id' field"
-    assert isinstance(comment_item["id"], int), f"ID field for comment {top_comment_id} is not an integer"
-    assert comment_item["id"] == top_comment_id, f"Comment ID {comment_item['id']} does not match requested ID {top_comment_id}"
-    assert "parent" in comment_item, f"Comment with ID {top_comment_id} is missing 'parent' field"
-    assert comment_item["parent"] == top_story_id, f"Comment parent ID {comment_item['parent']} does not match story ID {top_story_id}"
-
-@pytest.mark.asyncio
+    assert comment_item.id == top_comment_id, f"Comment ID {comment_item.id} does not match requested ID {top_comment_id}"
+    assert comment_item.parent is not None, f"Comment with ID {top_comment_id} is missing 'parent' field"
+    assert comment_item.parent == top_story_id, f"Comment parent ID {comment_item.parent} does not match story ID {top_story_id}"
+
+@pytest.mark.asyncio(loop_scope="session")
 async def test_total_comment_count(top_stories, client_session):
     """
     - Recursively traverse each top story and all its descendants via 'kids'
     - Count total number of comments across all stories
     """
-    async def count_descendants(item_id, session):
-        """Recursively count all kids (comments/replies) under an item."""
-        item = await fetch_item_async(item_id, session)
-        if not item or not isinstance(item, dict):
-            return 0
-        kids = item.get("kids", [])
-        count = len(kids)
-        # Recursively count for each kid
-        for kid_id in kids:
-            count += await count_descendants(kid_id, session)
-        return count
-
-    total_count = 0
-    stories_with_less_comments = await get_stories_with_less_comments(top_stories, client_session)
-    # To avoid overly long test runs, limited number of stories (here 6)
-    for story_id in stories_with_less_comments[:6]:  # process only first 6 stories for speed
+    async def count_descendants(root_id, session):
+        """Count all kids (comments/replies) under an item, fetching each level of the tree concurrently."""
+        queue = deque([root_id])
+        total = 0
+        while queue:
+            # Unpacking creates every fetch for this level before gather runs, so the queue can be cleared after
+            items = await asyncio.gather(*(fetch_item_async(item_id, session) for item_id in queue))
+            queue.clear()
+            for item in items:
+                if item is not None:
+                    total += len(item.kids)
+                    queue.extend(item.kids)
+        return total
+
+    async def check_story(story_id):
+        """Compare the recursive comment count of a story against its 'descendants' field."""
         story_item = await fetch_item_async(story_id, client_session)
-        descendants = story_item["descendants"]
+        assert story_item is not None, f"Failed to fetch story with ID {story_id}"
+        descendants = story_item.descendants
 
-        if story_item and "kids" in story_item:
-            total_count += await count_descendants(story_id, client_session)
+        total_count = 0
+        if story_item.kids:
+            total_count = await count_descendants(story_id, client_session)
         try:
             assert total_count == descendants
         except AssertionError:
-            print(f"Error - Comments and descendants MISMATCH for Story {story_id}: \n"
-                  f"Total comments (recursively) = {total_count}, Descendants = {descendants}")
-        # Reset total_count for the next story if it’s per-story
-        total_count = 0
+            logger.warning("Error - Comments and descendants MISMATCH for Story %s: \n"
+                           "Total comments (recursively) = %d, Descendants = %d", story_id, total_count, descendants)
 
-@pytest.mark.asyncio
+    stories_with_less_comments = await get_stories_with_less_comments(top_stories, client_session)
+    # To avoid overly long test runs, limited number of stories (here 6)
+    await asyncio.gather(*(check_story(story_id) for story_id in stories_with_less_comments[:6]))
+
+@pytest.mark.asyncio(loop_scope="session")
 async def test_top_stories_empty_response(client_session):
     """
     Test that the Top Stories API handles an empty response gracefully.
-    - Verify the response is an empty list.
+    - Verify fetch_top_stories_async returns an empty id array.
     - Ensure the application does not crash or throw unexpected errors.
     """
-    with patch("aiohttp.ClientSession.get") as mock_get:
-        mock_response = mock_get.return_value.__aenter__.return_value
-        mock_response.status = 200
-        mock_response.json = AsyncMock(return_value=[])
+    with aioresponses() as mocked:
+        mocked.get(_TOP_STORIES_URL, status=200, payload=[])
+
+        top_stories_mocked = await fetch_top_stories_async(client_session)
 
-        async with client_session.get("https://hacker-news.firebaseio.com/v0/topstories.json") as response:
-            assert response.status == 200, f"Expected status 200, got {response.status}"
-            top_stories_mocked = await response.json()
+    assert top_stories_mocked == array.array('i'), f"Expected empty id array, got {top_stories_mocked}"
 
-        assert top_stories_mocked == [], "Expected empty list for top stories"
-        assert isinstance(top_stories_mocked, list), "Response must be a list"
+@pytest.mark.asyncio(loop_scope="session")
+@pytest.mark.parametrize("payload", [[1, "a"], [1, 5000000000]], ids=["non-integer", "int32-overflow"])
+async def test_top_stories_invalid_ids(client_session, payload):
+    """
+    Test that the Top Stories API rejects ids that are not integers or do not fit in int32.
+    - Simulate a top-stories response with one such item.
+    - Verify fetch_top_stories_async returns None.
+    """
+    with aioresponses() as mocked:
+        mocked.get(_TOP_STORIES_URL, status=200, payload=payload)
 
-@pytest.mark.asyncio
+        top_stories_mocked = await fetch_top_stories_async(client_session)
+
+    assert top_stories_mocked is None, f"Expected None for invalid top-stories payload {payload}"
+
+@pytest.mark.asyncio(loop_scope="session")
 async def test_top_story_non_existent_id(top_stories, client_session):
     """
     Test that the Items API handles a non-existent story ID from top stories.
     - Simulate a 404 response for the top story ID.
+    - Verify the session raises ClientResponseError for the 404.
     - Verify the application handles the missing story gracefully.
     """
-    with patch("aiohttp.ClientSession.get") as mock_get:
-        mock_response = mock_get.return_value.__aenter__.return_value
-        mock_response.status = 404
-        mock_response.json = AsyncMock(return_value=None)
+    top_story_id = top_stories[0] if top_stories else 999999
+    url = f"https://hacker-news.firebaseio.com/v0/item/{top_story_id}.json"
+    with aioresponses() as mocked:
+        mocked.get(url, status=404, repeat=True)
 
-        top_story_id = top_stories[0] if top_stories else 999999
-        try:
-            async with client_session.get(f"https://hacker-news.firebaseio.com/v0/item/{top_story_id}.json") as response:
-                assert response.status == 404, f"Expected status 404, got {response.status}"
-                story_data = await response.json()
-                assert story_data is None, "Expected None for non-existent story"
-        except Exception as e:
-            assert False, f"Unexpected error for non-existent story ID: {e}"
-
-@pytest.mark.asyncio
+        with pytest.raises(aiohttp.ClientResponseError) as exc_info:
+            async with client_session.get(url):
+                pass
+        assert exc_info.value.status == 404, f"Expected status 404, got {exc_info.value.status}"
+
+        # Drop any memoized copy so fetch_item_async really sees the 404
+        _fetch_item_cached.cache_invalidate(top_story_id, client_session)
+        story_data = await fetch_item_async(top_story_id, client_session)
+        assert story_data is None, "Expected None for non-existent story"
+
+@pytest.mark.asyncio(loop_scope="session")
 async def test_top_story_missing_id(top_stories, client_session):
     """
     Test that the Items API handles a top story missing the mandatory 'id' field.
     - Simulate a response without the 'id' field.
-    - Verify the application detects and handles the missing field.
+    - Verify fetch_item_async rejects it with msgspec.ValidationError instead of returning an item.
     """
-    with patch("aiohttp.ClientSession.get") as mock_get:
-        mock_response = mock_get.return_value.__aenter__.return_value
-        mock_response.status = 200
-        mock_response.json = AsyncMock(return_value={
+    top_story_id = top_stories[0] if top_stories else 999999
+    url = f"https://hacker-news.firebaseio.com/v0/item/{top_story_id}.json"
+    with aioresponses() as mocked:
+        mocked.get(url, status=200, payload={
             "by": "test_user",
             "type": "story",
             "title": "Test Story",
             "time": 1234567890
         })  # No 'id' field
 
-        top_story_id = top_stories[0] if top_stories else 999999
-        try:
-            async with client_session.get(f"https://hacker-news.firebaseio.com/v0/item/{top_story_id}.json") as response:
-                assert response.status == 200, f"Expected status 200, got {response.status}"
-                story_data = await response.json()
-                assert "id" not in story_data, "Expected 'id' field to be missing"
-                # Add your application's specific validation logic here
-                # e.g., raise a custom exception or skip the story
-                assert True, "Application should handle missing 'id' field"
-        except Exception as e:
-            assert False, f"Unexpected error for missing 'id' field: {e}"
+        # Drop any memoized copy so fetch_item_async really sees the id-less payload
+        _fetch_item_cached.cache_invalidate(top_story_id, client_session)
+        with pytest.raises(msgspec.ValidationError, match="id"):
+            await fetch_item_async(top_story_id, client_session)
+
+_ALGOLIA_FRONT_PAGE_URL = "https://hn.algolia.com/api/v1/search?tags=front_page&hitsPerPage=50"
+
+@pytest.mark.asyncio(loop_scope="session")
+@pytest.mark.parametrize("algolia_response", [{"status": 500}, {"status": 200, "payload": {"hits": []}}],
+                         ids=["algolia-error", "algolia-no-hits"])
+async def test_stories_with_less_comments_fallback(client_session, algolia_response):
+    """
+    Test that get_stories_with_less_comments falls back to per-item fetches when Algolia is unusable.
+    - Simulate an Algolia error or an empty hits list, with stubbed Items API responses.
+    - Verify only stories with 0 < descendants < threshold are returned.
+    """
+    descendants = {9100001: 3, 9100002: 0, 9100003: 15, 9100004: 9}
+    with aioresponses() as mocked:
+        mocked.get(_ALGOLIA_FRONT_PAGE_URL, **algolia_response)
+        for story_id, count in descendants.items():
+            _fetch_item_cached.cache_invalidate(story_id, client_session)
+            mocked.get(f"https://hacker-news.firebaseio.com/v0/item/{story_id}.json",
+                       payload={"id": story_id, "type": "story", "descendants": count})
+
+        stories = await get_stories_with_less_comments(list(descendants), client_session, threshold=10)
+
+    assert sorted(stories) == [9100001, 9100004], f"Unexpected stories selected by fallback: {stories}"
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_stories_with_less_comments_from_algolia(client_session):
+    """
+    Test that get_stories_with_less_comments selects stories from the Algolia front page.
+    - Simulate Algolia hits including a story that is not in top stories.
+    - Verify that story is filtered out, the comment-count predicate holds and `limit` is honoured.
+    """
+    top_story_ids = [9200001, 9200002, 9200003, 9200004, 9200005]
+    hits = [{"objectID": "9299999", "num_comments": 5},  # not in top stories
+            {"objectID": "9200001", "num_comments": 3},
+            {"objectID": "9200002", "num_comments": 0},
+            {"objectID": "9200003", "num_comments": 12},
+            {"objectID": "9200004", "num_comments": 4},
+            {"objectID": "9200005", "num_comments": 7}]
+    with aioresponses() as mocked:
+        # No Items API responses are registered, so any per-item fallback fetch would fail the test
+        mocked.get(_ALGOLIA_FRONT_PAGE_URL, status=200, payload={"hits": hits})
+
+        stories = await get_stories_with_less_comments(top_story_ids, client_session, threshold=10, limit=2)
+
+    assert stories == [9200001, 9200004], f"Unexpected stories selected from Algolia: {stories}"
 
 
 if __name__ == "__main__":